@@ -1,7 +1,25 @@
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
 class Graph:
     def __init__(self):
         """Initialize an empty graph."""
-        self.adjacency_list = {}
+        # Vertices are stored internally as integer IDs (0..V-1) so the
+        # sorting loops index lists instead of hashing course-name strings
+        self.vertex_ids = {}  # name -> ID
+        self.vertex_names = []  # ID -> name
+        self.adjacency_list = []  # ID -> list of neighbor IDs
+        # ID -> set of neighbor IDs, for O(1) duplicate checks (None until
+        # first needed on a graph built by from_prerequisites)
+        self._edge_sets = []
+        
+        # Cached sort results as tuples (so callers cannot modify them),
+        # cleared whenever the graph changes
+        self._order_cache = None
+        self._kahn_order_cache = None
     
     def add_vertex(self, vertex):
         """
@@ -9,72 +27,252 @@ class Graph:
         
         Args:
             vertex: The vertex to add (typically a string like "CS 1411")
+        
+        Returns:
+            int: The integer ID assigned to the vertex
         """
-        if vertex not in self.adjacency_list:
-            self.adjacency_list[vertex] = []
+        if vertex not in self.vertex_ids:
+            self.vertex_ids[vertex] = len(self.vertex_names)
+            self.vertex_names.append(vertex)
+            self.adjacency_list.append([])
+            if self._edge_sets is not None:
+                self._edge_sets.append(set())
+            self._order_cache = None
+            self._kahn_order_cache = None
+        return self.vertex_ids[vertex]
     
     def add_edge(self, from_vertex, to_vertex):
         """
         Add a directed edge from from_vertex to to_vertex.
+        Adding an edge that already exists leaves the graph unchanged.
 
         """
-        if from_vertex not in self.adjacency_list:
-            self.add_vertex(from_vertex)
-        if to_vertex not in self.adjacency_list:
-            self.add_vertex(to_vertex)
+        from_id = self.add_vertex(from_vertex)
+        to_id = self.add_vertex(to_vertex)
+        
+        self._add_edge_ids(from_id, to_id)
+    
+    def _add_edge_ids(self, from_id, to_id):
+        """Add a directed edge between two vertex IDs, skipping duplicates."""
+        if self._edge_sets is None:
+            self._edge_sets = [set(neighbors) for neighbors in self.adjacency_list]
+        
+        targets = self._edge_sets[from_id]
+        if to_id not in targets:
+            targets.add(to_id)
+            self.adjacency_list[from_id].append(to_id)
+            self._order_cache = None
+            self._kahn_order_cache = None
+    
+    @classmethod
+    def from_prerequisites(cls, prerequisites):
+        """
+        Build a graph from a course -> prerequisites mapping in a single pass.
+        Each prerequisite gets an edge to the course that requires it;
+        a prerequisite listed twice still gives a single edge.
         
-        self.adjacency_list[from_vertex].append(to_vertex)
+        Args:
+            prerequisites: Dict mapping each course to a list of its prerequisites
+        
+        Returns:
+            Graph: A graph with an edge prerequisite -> course for every pair
+        """
+        graph = cls()
+        vertex_ids = graph.vertex_ids  # Local lookups are faster in the loop below
+        names = graph.vertex_names
+        adj = graph.adjacency_list
+        
+        # Vertex IDs follow the order in which courses are first seen. A fresh
+        # graph has no cached sorts, so nothing needs invalidating per edge.
+        for course, prereqs in prerequisites.items():
+            course_id = vertex_ids.get(course)
+            if course_id is None:
+                course_id = vertex_ids[course] = len(names)
+                names.append(course)
+                adj.append([])
+            
+            for prereq in prereqs:
+                prereq_id = vertex_ids.get(prereq)
+                if prereq_id is None:
+                    prereq_id = vertex_ids[prereq] = len(names)
+                    names.append(prereq)
+                    adj.append([])
+                
+                # An edge can only repeat within one course's own list, so a
+                # duplicate is always the last target appended for prereq
+                targets = adj[prereq_id]
+                if not targets or targets[-1] != course_id:
+                    targets.append(course_id)
+        
+        # Duplicate-check sets are only built if edges are added later
+        graph._edge_sets = None
+        
+        return graph
     
     def topological_sort(self):
         """
         Perform a topological sort on the graph using DFS.
+        The result is cached until the graph is modified.
         
         Returns:
             list: A list of vertices in topological order, or empty list if cycle detected
         """
-        # State tracking for DFS:
+        if self._order_cache is not None:
+            return list(self._order_cache)
+        
+        # State tracking for DFS, one byte per vertex ID:
         # 0: Unvisited (White)
-        # 1: Visiting (Grey - in current recursion stack)
+        # 1: Visiting (Grey - in current DFS stack)
         # 2: Visited (Black - finished processing)
-        visit_state = {vertex: 0 for vertex in self.adjacency_list}
-        topological_order = []
+        adj = self.adjacency_list  # Local lookups are faster in the loops below
+        visit_state = bytearray(len(adj))
+        names = self.vertex_names
+        
+        # Finished vertices are written from the back, so no reverse is needed
+        topological_order = [None] * len(adj)
+        index = len(adj) - 1  # Next slot to fill
         is_dag = True  # Flag to detect cycles
         
-        def dfs(vertex):
-            """Helper function to perform DFS recursively."""
-            nonlocal is_dag
-            
-            if visit_state[vertex] == 1:
-                # Found a cycle (back edge to a node currently in the stack)
-                is_dag = False
-                return
-            
-            if visit_state[vertex] == 2:
-                # Already visited and processed
-                return
+        # Iterative DFS with an explicit stack of (vertex, neighbor iterator)
+        # frames, so deep prerequisite chains do not hit the recursion limit
+        for vertex in range(len(adj)):
+            if visit_state[vertex] != 0:
+                continue
             
             visit_state[vertex] = 1  # Mark as Visiting
+            work_stack = [(vertex, iter(adj[vertex]))]
             
-            # Recursively visit all neighbors
-            for neighbor in self.adjacency_list[vertex]:
-                dfs(neighbor)
+            while work_stack:
+                current, neighbors = work_stack[-1]
+                neighbor = next(neighbors, None)
+                
+                if neighbor is None:
+                    # All neighbors processed
+                    work_stack.pop()
+                    visit_state[current] = 2  # Mark as Visited (Finished processing)
+                    
+                    # Place vertex before everything that depends on it
+                    topological_order[index] = names[current]
+                    index -= 1
+                elif visit_state[neighbor] == 0:
+                    visit_state[neighbor] = 1  # Mark as Visiting
+                    work_stack.append((neighbor, iter(adj[neighbor])))
+                elif visit_state[neighbor] == 1:
+                    # Found a cycle (back edge to a node currently in the stack)
+                    is_dag = False
+                    break
             
-            visit_state[vertex] = 2  # Mark as Visited (Finished processing)
-            
-            # Add vertex to the front of the list after all dependents are visited
-            topological_order.insert(0, vertex)
-        
-        # Run DFS on all vertices to ensure complete coverage
-        for vertex in self.adjacency_list:
-            if visit_state[vertex] == 0:
-                dfs(vertex)
+            if not is_dag:
+                break
         
         # Return empty list if cycle detected
         if not is_dag:
+            self._order_cache = ()
             return []
         
+        self._order_cache = tuple(topological_order)
         return topological_order
     
+    def _in_degrees(self):
+        """Return the number of incoming edges of every vertex, indexed by ID."""
+        in_degree = [0] * len(self.adjacency_list)
+        for neighbors in self.adjacency_list:
+            for neighbor in neighbors:
+                in_degree[neighbor] += 1
+        return in_degree
+    
+    def topological_sort_kahn(self):
+        """
+        Perform a topological sort on the graph using Kahn's algorithm.
+        The result is cached until the graph is modified.
+        
+        Returns:
+            list: A list of vertices in topological order, or empty list if cycle detected
+        """
+        if self._kahn_order_cache is not None:
+            return list(self._kahn_order_cache)
+        
+        adj = self.adjacency_list  # Local lookups are faster in the loops below
+        in_degree = self._in_degrees()
+        
+        # Start from every vertex with no prerequisites
+        queue = deque(vertex for vertex, degree in enumerate(in_degree) if degree == 0)
+        popleft = queue.popleft
+        push = queue.append
+        topological_order = []
+        append = topological_order.append
+        
+        while queue:
+            vertex = popleft()
+            append(vertex)
+            
+            # Removing vertex may free up its dependents
+            for neighbor in adj[vertex]:
+                in_degree[neighbor] -= 1
+                if in_degree[neighbor] == 0:
+                    push(neighbor)
+        
+        # Vertices left unprocessed are part of a cycle
+        if len(topological_order) != len(adj):
+            self._kahn_order_cache = ()
+            return []
+        
+        names = self.vertex_names
+        self._kahn_order_cache = tuple(names[vertex] for vertex in topological_order)
+        return list(self._kahn_order_cache)
+    
+    def topological_sort_parallel(self, max_workers=4, threshold=64):
+        """
+        Perform a topological sort using Kahn's algorithm one level at a time.
+        Every vertex in the current frontier (all vertices with no remaining
+        prerequisites) is independent, so large frontiers are processed by a
+        thread pool. Small frontiers run serially to avoid the pool overhead.
+        Unlike the other sorts, the result is not cached; every call recomputes it.
+        
+        Args:
+            max_workers: Number of worker threads
+            threshold: Minimum frontier size to hand to the thread pool
+        
+        Returns:
+            list: A list of vertices in topological order, or empty list if cycle detected
+        """
+        adj = self.adjacency_list
+        in_degree = self._in_degrees()
+        
+        in_degree_lock = threading.Lock()
+        
+        def process_vertex(vertex):
+            """Remove vertex from the graph and return the dependents it frees up."""
+            ready = []
+            for neighbor in adj[vertex]:
+                with in_degree_lock:
+                    in_degree[neighbor] -= 1
+                    remaining = in_degree[neighbor]
+                if remaining == 0:
+                    ready.append(neighbor)
+            return ready
+        
+        frontier = [vertex for vertex, degree in enumerate(in_degree) if degree == 0]
+        topological_order = []
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while frontier:
+                topological_order.extend(frontier)
+                
+                if len(frontier) < threshold:
+                    results = map(process_vertex, frontier)
+                else:
+                    results = executor.map(process_vertex, frontier)
+                
+                frontier = [neighbor for ready in results for neighbor in ready]
+        
+        # Vertices left unprocessed are part of a cycle
+        if len(topological_order) != len(adj):
+            return []
+        
+        names = self.vertex_names
+        return [names[vertex] for vertex in topological_order]
+    
     def display_topological_order(self, order, courses_per_line=4):
         """
         Display the topological order in a formatted way.
@@ -87,17 +285,22 @@ class Graph:
             print("Error: The prerequisites contain a cycle. A valid topological ordering is impossible.")
             return
         
-        print("\n Valid Course Sequence (Topological Order): ")
-        print("=" * 80)
-        
-        for i, course in enumerate(order):
-            # Print specified number of courses per line
-            if i > 0 and i % courses_per_line == 0:
-                print()
-            print(f"{i+1:02}. {course:<10}", end=" | ")
+        # Pad every entry to the longest course name (vertices need not be
+        # strings), then group the specified number of courses per line
+        labels = [str(course) for course in order]
+        width = max(map(len, labels))
+        entries = [f"{i+1:02}. {label:<{width}} | " for i, label in enumerate(labels)]
+        lines = ["".join(entries[start:start + courses_per_line])
+                 for start in range(0, len(entries), courses_per_line)]
         
-        print("\n" + "=" * 80)
-        print("(This represents one possible sequence, as multiple valid orderings may exist.)\n")
+        # Emit the whole table with a single write
+        sys.stdout.write(
+            "\n Valid Course Sequence (Topological Order): \n"
+            + "=" * 80 + "\n"
+            + "\n".join(lines) + "\n"
+            + "=" * 80 + "\n"
+            + "(This represents one possible sequence, as multiple valid orderings may exist.)\n\n"
+        )
 
 
 def build_cs_major_graph():
@@ -140,20 +343,9 @@ def build_cs_major_graph():
         "CS 4366": ["CS 4365"]
     }
     
-    # Create graph instance
-    graph = Graph()
-    
-    # Add all vertices first
-    for course in prerequisites:
-        graph.add_vertex(course)
-    
-    # Add edges (prerequisite -> course relationship)
+    # Create graph instance with edges (prerequisite -> course relationship)
     # We need to invert the relationship: if A is prerequisite for B, add edge A -> B
-    for course, prereqs in prerequisites.items():
-        for prereq in prereqs:
-            graph.add_edge(prereq, course)
-    
-    return graph
+    return Graph.from_prerequisites(prerequisites)
 
 
 def test_graph_adt():
@@ -207,6 +399,109 @@ def test_graph_adt():
     print(f"Expected: ['Single']")
     print(f"Pass: {order4 == ['Single']}")
     
+    # Test 5: Kahn's algorithm
+    print("\n[Test 5] Kahn's Algorithm (A -> B -> C)")
+    print("-" * 80)
+    order5 = g1.topological_sort_kahn()
+    print(f"Result: {order5}")
+    print(f"Expected: ['A', 'B', 'C']")
+    print(f"Pass: {order5 == ['A', 'B', 'C']}")
+    
+    # Test 6: Cycle detection
+    print("\n[Test 6] Cycle Detection (A -> B -> A)")
+    print("-" * 80)
+    g6 = Graph()
+    g6.add_edge("A", "B")
+    g6.add_edge("B", "A")
+    order6_dfs = g6.topological_sort()
+    order6_kahn = g6.topological_sort_kahn()
+    print(f"Result: DFS={order6_dfs}, Kahn={order6_kahn}")
+    print(f"Expected: []")
+    print(f"Pass: {order6_dfs == [] and order6_kahn == []}")
+    
+    # Test 7: Compiled Kahn kernel (falls back to Kahn's algorithm without Numba)
+    # graph_kernels is only needed here, so the main program runs without it
+    from graph_kernels import NUMBA_AVAILABLE, topological_sort_numba
+    
+    print("\n[Test 7] Numba Kahn Kernel (chain, CS major graph, cycle, empty graph)")
+    print("-" * 80)
+    g7 = build_cs_major_graph()
+    order7 = topological_sort_numba(g1)
+    order7_cs = topological_sort_numba(g7)
+    order7_cycle = topological_sort_numba(g6)
+    order7_empty = topological_sort_numba(g3)
+    print(f"Result: {order7} (Numba available: {NUMBA_AVAILABLE})")
+    print(f"Expected: ['A', 'B', 'C'], same as Kahn's algorithm on every graph")
+    print(f"Pass: {order7 == ['A', 'B', 'C'] and order7_cs == g7.topological_sort_kahn() and order7_cycle == [] and order7_empty == []}")
+    
+    # Test 8: Cached order is refreshed after the graph changes
+    print("\n[Test 8] Cache Invalidation (add C -> D after sorting)")
+    print("-" * 80)
+    g8 = Graph()
+    g8.add_edge("A", "B")
+    g8.add_edge("B", "C")
+    g8.topological_sort()
+    g8.add_edge("C", "D")
+    order8 = g8.topological_sort()
+    print(f"Result: {order8}")
+    print(f"Expected: ['A', 'B', 'C', 'D']")
+    print(f"Pass: {order8 == ['A', 'B', 'C', 'D']}")
+    
+    # Test 9: Level-by-level Kahn's algorithm with every frontier sent to the thread pool
+    print("\n[Test 9] Parallel Kahn's Algorithm (CS major graph)")
+    print("-" * 80)
+    g9 = build_cs_major_graph()
+    order9 = g9.topological_sort_parallel(threshold=1)
+    position = {course: i for i, course in enumerate(order9)}
+    valid9 = len(order9) == len(g9.vertex_names) and all(
+        position[g9.vertex_names[u]] < position[g9.vertex_names[v]]
+        for u, neighbors in enumerate(g9.adjacency_list)
+        for v in neighbors
+    )
+    print(f"Result: {len(order9)} courses")
+    print(f"Valid: every course comes after all of its prerequisites")
+    print(f"Pass: {valid9}")
+    
+    # Test 10: Duplicate edges are stored once, from add_edge and from a prerequisites dict
+    print("\n[Test 10] Duplicate Edge (A -> B added twice)")
+    print("-" * 80)
+    g10 = Graph()
+    g10.add_edge("A", "B")
+    g10.add_edge("A", "B")
+    g10_bulk = Graph.from_prerequisites({"A": [], "B": ["A", "A"]})
+    edges10 = g10.adjacency_list[g10.vertex_ids["A"]]
+    edges10_bulk = g10_bulk.adjacency_list[g10_bulk.vertex_ids["A"]]
+    print(f"Result: add_edge={len(edges10)} edge(s), from_prerequisites={len(edges10_bulk)} edge(s)")
+    print(f"Expected: 1 edge each")
+    print(f"Pass: {edges10 == [g10.vertex_ids['B']] and edges10_bulk == [g10_bulk.vertex_ids['B']]}")
+    
+    # Test 11: Changing a returned order does not change the cached order
+    print("\n[Test 11] Cached Order Is Protected (clear the returned list, then sort again)")
+    print("-" * 80)
+    g11 = Graph()
+    g11.add_edge("A", "B")
+    g11.add_edge("B", "C")
+    g11.topological_sort().clear()
+    g11.topological_sort_kahn().clear()
+    order11_dfs = g11.topological_sort()
+    order11_kahn = g11.topological_sort_kahn()
+    print(f"Result: DFS={order11_dfs}, Kahn={order11_kahn}")
+    print(f"Expected: ['A', 'B', 'C']")
+    print(f"Pass: {order11_dfs == ['A', 'B', 'C'] and order11_kahn == ['A', 'B', 'C']}")
+    
+    # Test 12: Displaying an order of non-string vertices
+    print("\n[Test 12] Display Integer Vertices (1 -> 22)")
+    print("-" * 80)
+    g12 = Graph()
+    g12.add_edge(1, 22)
+    try:
+        g12.display_topological_order(g12.topological_sort())
+        displayed12 = True
+    except TypeError:
+        displayed12 = False
+    print(f"Expected: the table above, without a TypeError")
+    print(f"Pass: {displayed12}")
+    
     print("\n" + "="*80)
     print("TEST COMPLETE")
     print("="*80 + "\n")
@@ -221,18 +516,19 @@ def main():
     print("Topological Ordering of Computer Science Major Courses")
     print("="*80)
     
-    # Run tests first (YOU CAN REMOVE THIS WHEN YOU RUN THIS GUYS - BRANDON)
-    test_graph_adt()
+    # Run tests first only when asked: python Project2_Refined.py --test
+    if "--test" in sys.argv:
+        test_graph_adt()
     
     # Build the CS major course graph
     print("\n[MAIN PROBLEM] Building Computer Science Major Course Graph...")
     cs_graph = build_cs_major_graph()
     
     print(f"Total courses: {len(cs_graph.adjacency_list)}")
-    print(f"Performing topological sort using DFS...")
+    print(f"Performing topological sort using Kahn's algorithm...")
     
     # Get topological order
-    course_order = cs_graph.topological_sort()
+    course_order = cs_graph.topological_sort_kahn()
     
     # Display results
     cs_graph.display_topological_order(course_order)
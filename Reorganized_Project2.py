@@ -2,13 +2,28 @@
 CS3364 Algorithms: Project 2
 By: Kartavya Sharma, Jeremiah Kornbau, Vaishnavi Makkapati, Brandon Gramlich, Amish Bhakta
 This program uses the sorting and organizational methods for Topological Ordering
-It takes this task on from the Depth First Search method
+It takes this task on from the Depth First Search method and Kahn's algorithm
 """
 
+import sys
+from collections import deque
+
 class Graph:
     def __init__(self):
         """Initialize an empty graph."""
-        self.adjacency_list = {}
+        # Vertices are stored internally as integer IDs (0..V-1) so the
+        # sorting loops index lists instead of hashing course-name strings
+        self.vertex_ids = {}  # name -> ID
+        self.vertex_names = []  # ID -> name
+        self.adjacency_list = []  # ID -> list of neighbor IDs
+        # ID -> set of neighbor IDs, for O(1) duplicate checks (None until
+        # first needed on a graph built by from_prerequisites)
+        self._edge_sets = []
+        
+        # Cached sort results as tuples (so callers cannot modify them),
+        # cleared whenever the graph changes
+        self._order_cache = None
+        self._kahn_order_cache = None
     
     def add_vertex(self, vertex):
         """
@@ -16,68 +31,200 @@ class Graph:
         
         Args:
             vertex: The vertex to add (typically a string like "CS 1411")
+        
+        Returns:
+            int: The integer ID assigned to the vertex
         """
-        if vertex not in self.adjacency_list:
-            self.adjacency_list[vertex] = []
+        if vertex not in self.vertex_ids:
+            self.vertex_ids[vertex] = len(self.vertex_names)
+            self.vertex_names.append(vertex)
+            self.adjacency_list.append([])
+            if self._edge_sets is not None:
+                self._edge_sets.append(set())
+            self._order_cache = None
+            self._kahn_order_cache = None
+        return self.vertex_ids[vertex]
     "def add_edge(self, from_vertex, to_vertex):"
     def add_edge(self, u, v):
         """
         Add a directed edge from from_vertex to to_vertex.
+        Adding an edge that already exists leaves the graph unchanged.
 
         """
-        if u not in self.adjacency_list:
-            self.add_vertex(u)
-        if v not in self.adjacency_list:
-            self.add_vertex(v)
+        u_id = self.add_vertex(u)
+        v_id = self.add_vertex(v)
+        
+        self._add_edge_ids(u_id, v_id)
+    
+    def _add_edge_ids(self, from_id, to_id):
+        """Add a directed edge between two vertex IDs, skipping duplicates."""
+        if self._edge_sets is None:
+            self._edge_sets = [set(neighbors) for neighbors in self.adjacency_list]
+        
+        targets = self._edge_sets[from_id]
+        if to_id not in targets:
+            targets.add(to_id)
+            self.adjacency_list[from_id].append(to_id)
+            self._order_cache = None
+            self._kahn_order_cache = None
+    
+    @classmethod
+    def from_prerequisites(cls, prerequisites):
+        """
+        Build a graph from a course -> prerequisites mapping in a single pass.
+        Each prerequisite gets an edge to the course that requires it;
+        a prerequisite listed twice still gives a single edge.
+        
+        Args:
+            prerequisites: Dict mapping each course to a list of its prerequisites
+        
+        Returns:
+            Graph: A graph with an edge prerequisite -> course for every pair
+        """
+        graph = cls()
+        vertex_ids = graph.vertex_ids  # Local lookups are faster in the loop below
+        names = graph.vertex_names
+        adj = graph.adjacency_list
+        
+        # Vertex IDs follow the order in which courses are first seen. A fresh
+        # graph has no cached sorts, so nothing needs invalidating per edge.
+        for course, prereqs in prerequisites.items():
+            course_id = vertex_ids.get(course)
+            if course_id is None:
+                course_id = vertex_ids[course] = len(names)
+                names.append(course)
+                adj.append([])
+            
+            for prereq in prereqs:
+                prereq_id = vertex_ids.get(prereq)
+                if prereq_id is None:
+                    prereq_id = vertex_ids[prereq] = len(names)
+                    names.append(prereq)
+                    adj.append([])
+                
+                # An edge can only repeat within one course's own list, so a
+                # duplicate is always the last target appended for prereq
+                targets = adj[prereq_id]
+                if not targets or targets[-1] != course_id:
+                    targets.append(course_id)
+        
+        # Duplicate-check sets are only built if edges are added later
+        graph._edge_sets = None
         
-        self.adjacency_list[u].append(v)
+        return graph
     
     def topological_sort(self):
         """
         Perform a topological sort on the graph using DFS.
+        The result is cached until the graph is modified.
         
         Returns:
             list: A list of vertices in topological order, or empty list if cycle detected
         """
-        visit_state = {vertex: 0 for vertex in self.adjacency_list}
-        topological_order = []
+        if self._order_cache is not None:
+            return list(self._order_cache)
+        
+        adj = self.adjacency_list  # Local lookups are faster in the loops below
+        # State tracking for DFS, one byte per vertex ID:
+        # 0: Unvisited (White)
+        # 1: Visiting (Grey - in current DFS stack)
+        # 2: Visited (Black - finished processing)
+        visit_state = bytearray(len(adj))
+        names = self.vertex_names
+        
+        # Finished vertices are written from the back, so no reverse is needed
+        topological_order = [None] * len(adj)
+        index = len(adj) - 1  # Next slot to fill
         is_dag = True  # Flag to detect cycles
         
-        def dfs(vertex):
-            """Helper function to perform DFS recursively."""
-            nonlocal is_dag
-            
-            if visit_state[vertex] == 1:
-                # Found a cycle (back edge to a node currently in the stack)
-                is_dag = False
-                return
-            
-            if visit_state[vertex] == 2:
-                # Already visited and processed
-                return
+        # Iterative DFS with an explicit stack of (vertex, neighbor iterator)
+        # frames, so deep prerequisite chains do not hit the recursion limit
+        for vertex in range(len(adj)):
+            if visit_state[vertex] != 0:
+                continue
             
             visit_state[vertex] = 1  # Mark as Visiting
+            work_stack = [(vertex, iter(adj[vertex]))]
             
-            # Recursively visit all neighbors
-            for neighbor in self.adjacency_list[vertex]:
-                dfs(neighbor)
+            while work_stack:
+                current, neighbors = work_stack[-1]
+                neighbor = next(neighbors, None)
+                
+                if neighbor is None:
+                    # All neighbors processed
+                    work_stack.pop()
+                    visit_state[current] = 2  # Mark as Visited (Finished processing)
+                    
+                    # Place vertex before everything that depends on it
+                    topological_order[index] = names[current]
+                    index -= 1
+                elif visit_state[neighbor] == 0:
+                    visit_state[neighbor] = 1  # Mark as Visiting
+                    work_stack.append((neighbor, iter(adj[neighbor])))
+                elif visit_state[neighbor] == 1:
+                    # Found a cycle (back edge to a node currently in the stack)
+                    is_dag = False
+                    break
             
-            visit_state[vertex] = 2  # Mark as Visited (Finished processing)
-            
-            # Add vertex to the front of the list after all dependents are visited
-            topological_order.insert(0, vertex)
-        
-        # Run DFS on all vertices to ensure complete coverage
-        for vertex in self.adjacency_list:
-            if visit_state[vertex] == 0:
-                dfs(vertex)
+            if not is_dag:
+                break
         
         # Return empty list if cycle detected
         if not is_dag:
+            self._order_cache = ()
             return []
         
+        self._order_cache = tuple(topological_order)
         return topological_order
     
+    def _in_degrees(self):
+        """Return the number of incoming edges of every vertex, indexed by ID."""
+        in_degree = [0] * len(self.adjacency_list)
+        for neighbors in self.adjacency_list:
+            for neighbor in neighbors:
+                in_degree[neighbor] += 1
+        return in_degree
+    
+    def topological_sort_kahn(self):
+        """
+        Perform a topological sort on the graph using Kahn's algorithm.
+        The result is cached until the graph is modified.
+        
+        Returns:
+            list: A list of vertices in topological order, or empty list if cycle detected
+        """
+        if self._kahn_order_cache is not None:
+            return list(self._kahn_order_cache)
+        
+        adj = self.adjacency_list  # Local lookups are faster in the loops below
+        in_degree = self._in_degrees()
+        
+        # Start from every vertex with no prerequisites
+        queue = deque(vertex for vertex, degree in enumerate(in_degree) if degree == 0)
+        popleft = queue.popleft
+        push = queue.append
+        topological_order = []
+        append = topological_order.append
+        
+        while queue:
+            vertex = popleft()
+            append(vertex)
+            
+            # Removing vertex may free up its dependents
+            for neighbor in adj[vertex]:
+                in_degree[neighbor] -= 1
+                if in_degree[neighbor] == 0:
+                    push(neighbor)
+        
+        # Vertices left unprocessed are part of a cycle
+        if len(topological_order) != len(adj):
+            self._kahn_order_cache = ()
+            return []
+        
+        names = self.vertex_names
+        self._kahn_order_cache = tuple(names[vertex] for vertex in topological_order)
+        return list(self._kahn_order_cache)
+    
     def display_topological_order(self, order, courses_per_line=4):
         """
         Display the topological order in a formatted way.
@@ -90,17 +237,22 @@ class Graph:
             print("Error: The prerequisites contain a cycle. A valid topological ordering is impossible.")
             return
         
-        print("\n Valid Course Sequence (Topological Order): ")
-        print("=" * 80)
-        
-        for i, course in enumerate(order):
-            # Print specified number of courses per line
-            if i > 0 and i % courses_per_line == 0:
-                print()
-            print(f"{i+1:02}. {course:<10}", end=" | ")
+        # Pad every entry to the longest course name (vertices need not be
+        # strings), then group the specified number of courses per line
+        labels = [str(course) for course in order]
+        width = max(map(len, labels))
+        entries = [f"{i+1:02}. {label:<{width}} | " for i, label in enumerate(labels)]
+        lines = ["".join(entries[start:start + courses_per_line])
+                 for start in range(0, len(entries), courses_per_line)]
         
-        print("\n" + "=" * 80)
-        print("(This represents one of many possible orderings.)\n")
+        # Emit the whole table with a single write
+        sys.stdout.write(
+            "\n Valid Course Sequence (Topological Order): \n"
+            + "=" * 80 + "\n"
+            + "\n".join(lines) + "\n"
+            + "=" * 80 + "\n"
+            + "(This represents one of many possible orderings.)\n\n"
+        )
 
 
 def build_cs_major_graph():
@@ -143,19 +295,8 @@ def build_cs_major_graph():
         "CS 4366": ["CS 4365"]
     }
     
-    # Create graph instance
-    graph = Graph()
-    
-    # Add all vertices
-    for course in prerequisites:
-        graph.add_vertex(course)
-    
-    # Add edges (prerequisite -> course relationship)
-    for course, prereqs in prerequisites.items():
-        for prereq in prereqs:
-            graph.add_edge(prereq, course)
-    
-    return graph
+    # Create graph instance with edges (prerequisite -> course relationship)
+    return Graph.from_prerequisites(prerequisites)
 
 
 def main():
@@ -171,7 +312,7 @@ def main():
 
     # Get and Print Result
     print(f"Total courses: {len(cs_graph.adjacency_list)}")
-    course_order = cs_graph.topological_sort()
+    course_order = cs_graph.topological_sort_kahn()
     cs_graph.display_topological_order(course_order)
     
     # Additional statistics
@@ -0,0 +1,111 @@
+"""
+CS3364 Algorithms: Project 2
+Compiled kernels for the Graph ADT.
+
+The topological sort is run on a CSR (compressed sparse row) copy of the
+graph's integer adjacency list: indptr[u]..indptr[u+1] is the slice of
+indices holding the neighbors of vertex u. Numba and NumPy are optional;
+without them topological_sort_numba falls back to Graph.topological_sort_kahn.
+
+To exercise the compiled path, install them (pip install numba numpy) and
+run: python Project2_Refined.py --test
+Test 7 reports whether Numba was available and checks the kernel against
+Graph.topological_sort_kahn.
+"""
+
+try:
+    import numpy as np
+    from numba import int32, njit
+except ImportError:
+    NUMBA_AVAILABLE = False
+else:
+    NUMBA_AVAILABLE = True
+
+
+if NUMBA_AVAILABLE:
+    @njit(int32[:](int32[:], int32[:], int32), cache=True)
+    def kahn_csr(indptr, indices, num_vertices):
+        """
+        Kahn's algorithm on a CSR graph, compiled to native code.
+
+        Args:
+            indptr: Row offsets into indices (length num_vertices + 1)
+            indices: Neighbor IDs of every vertex, stored back to back
+            num_vertices: Number of vertices in the graph
+
+        Returns:
+            array: Vertex IDs in topological order (shorter than num_vertices if cycle detected)
+        """
+        # Count incoming edges for every vertex
+        in_degree = np.zeros(num_vertices, np.int32)
+        for i in range(indices.shape[0]):
+            in_degree[indices[i]] += 1
+
+        # Every vertex is enqueued at most once, so the queue doubles as the output
+        queue = np.empty(num_vertices, np.int32)
+        head = 0
+        tail = 0
+        for vertex in range(num_vertices):
+            if in_degree[vertex] == 0:
+                queue[tail] = vertex
+                tail += 1
+
+        while head < tail:
+            vertex = queue[head]
+            head += 1
+
+            # Removing vertex may free up its dependents
+            for i in range(indptr[vertex], indptr[vertex + 1]):
+                neighbor = indices[i]
+                in_degree[neighbor] -= 1
+                if in_degree[neighbor] == 0:
+                    queue[tail] = neighbor
+                    tail += 1
+
+        return queue[:tail]
+
+
+def build_csr(adjacency_list):
+    """
+    Convert an integer adjacency list into CSR arrays.
+
+    Args:
+        adjacency_list: List of neighbor-ID lists, indexed by vertex ID
+
+    Returns:
+        tuple: (indptr, indices) as int32 NumPy arrays
+    """
+    num_vertices = len(adjacency_list)
+    indptr = np.zeros(num_vertices + 1, np.int32)
+    np.cumsum([len(neighbors) for neighbors in adjacency_list], out=indptr[1:])
+
+    indices = np.empty(indptr[-1], np.int32)
+    for vertex, neighbors in enumerate(adjacency_list):
+        indices[indptr[vertex]:indptr[vertex + 1]] = neighbors
+
+    return indptr, indices
+
+
+def topological_sort_numba(graph):
+    """
+    Perform a topological sort on a Graph using the compiled Kahn kernel.
+
+    Args:
+        graph: The Graph to sort
+
+    Returns:
+        list: A list of vertices in topological order, or empty list if cycle detected
+    """
+    if not NUMBA_AVAILABLE:
+        return graph.topological_sort_kahn()
+
+    num_vertices = len(graph.adjacency_list)
+    indptr, indices = build_csr(graph.adjacency_list)
+    order = kahn_csr(indptr, indices, num_vertices)
+
+    # Vertices left unprocessed are part of a cycle
+    if len(order) != num_vertices:
+        return []
+
+    names = graph.vertex_names
+    return [names[vertex] for vertex in order.tolist()]